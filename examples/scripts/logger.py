@@ -6,7 +6,6 @@ Logs the current time and service name every second.
 
 import sys
 import time
-from datetime import datetime
 
 def main():
     if len(sys.argv) < 2:
@@ -18,10 +17,19 @@ def main():
     print(f"[{service_name}] Starting logger service", flush=True)
 
     try:
+        # Sleep to absolute deadlines so the print cost does not add drift
+        deadline = time.monotonic()
+        minute = None
+        prefix = ""
         while True:
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            print(f"[{service_name}] {current_time} - Heartbeat", flush=True)
-            time.sleep(1)
+            now = int(time.time())
+            # Only the seconds change within a minute, so format the rest once
+            if now // 60 != minute:
+                minute = now // 60
+                prefix = time.strftime("%Y-%m-%d %H:%M", time.localtime(now))
+            print(f"[{service_name}] {prefix}:{now % 60:02d} - Heartbeat", flush=True)
+            deadline += 1.0
+            time.sleep(max(0.0, deadline - time.monotonic()))
     except KeyboardInterrupt:
         print(f"\n[{service_name}] Shutting down gracefully", flush=True)
         sys.exit(0)
@@ -12,22 +12,25 @@ It demonstrates:
 import os
 import signal
 import sys
+import threading
 import time
 
 # Add SDK to path (adjust path as needed)
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../../sdk/krill-python"))
 
-from krill import KrillClient
+from krill import KrillClient, sleep_until
 
-# Global flag for graceful shutdown
-shutdown_requested = False
+# Period between loop iterations, in nanoseconds
+LOOP_PERIOD_NS = 1_000_000_000
+
+# Set on SIGTERM/SIGINT; also wakes the loop from its sleep between iterations
+shutdown = threading.Event()
 
 
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully."""
-    global shutdown_requested
     print(f"\n[data-analyzer] Received signal {signum}, shutting down gracefully...")
-    shutdown_requested = True
+    shutdown.set()
 
 
 def analyze_data(iteration):
@@ -53,51 +56,60 @@ def main():
 
     # Connect to Krill daemon
     try:
-        client = KrillClient("data-analyzer")
-        print("[data-analyzer] Connected to Krill daemon")
+        if "KRILL_FD" in os.environ:
+            # Reuse a daemon connection handed down by the launcher
+            client = KrillClient.from_fd("data-analyzer", int(os.environ["KRILL_FD"]))
+        else:
+            client = KrillClient("data-analyzer")
+        print("[data-analyzer] Krill client ready (connects on first heartbeat)")
     except Exception as e:
-        print(f"[data-analyzer] Failed to connect to Krill daemon: {e}")
+        print(f"[data-analyzer] Failed to create Krill client: {e}")
         return 1
 
     iteration = 0
-
-    try:
-        while not shutdown_requested:
-            iteration += 1
-
-            # Simulate data analysis
-            result = analyze_data(iteration)
-
-            # Report status based on analysis results
-            try:
-                if result["status"] == "warning":
-                    # Report degraded status when anomalies detected
-                    client.report_degraded(f"Detected {result['anomalies']} anomalies")
-                    print(
-                        f"[data-analyzer] ⚠️  Degraded: {result['anomalies']} anomalies in batch {iteration}"
-                    )
-                else:
-                    # Normal healthy status
-                    client.heartbeat_with_metadata(
-                        {"iteration": str(iteration), "status": result["status"]}
-                    )
-                    print(f"[data-analyzer] ✓ Healthy (batch {iteration})")
-            except Exception as e:
-                print(f"[data-analyzer] Failed to send heartbeat: {e}")
-                # Health check will fail, Krill will restart us (up to 3 times)
-
-            # Sleep between iterations
-            time.sleep(1)
-
-    except Exception as e:
-        print(f"[data-analyzer] Error in main loop: {e}")
-        return 1
-
-    finally:
-        # Clean shutdown
-        print("[data-analyzer] Closing connection to Krill daemon")
-        client.close()
-        print("[data-analyzer] Service stopped")
+    deadline = time.monotonic_ns()
+
+    with client:
+        try:
+            while not shutdown.is_set():
+                iteration += 1
+
+                # Simulate data analysis
+                result = analyze_data(iteration)
+
+                # Report status based on analysis results
+                try:
+                    if result["status"] == "warning":
+                        # Report degraded status when anomalies detected
+                        client.report_degraded(f"Detected {result['anomalies']} anomalies")
+                        print(
+                            f"[data-analyzer] ⚠️  Degraded: {result['anomalies']} anomalies in batch {iteration}"
+                        )
+                    else:
+                        # Normal healthy status
+                        # Pre-encoded JSON pairs skip building a metadata dict
+                        client.heartbeat_kv(
+                            (b'"iteration"', b'"%d"' % iteration),
+                            (b'"status"', b'"%s"' % result["status"].encode()),
+                        )
+                        print(f"[data-analyzer] ✓ Healthy (batch {iteration})")
+                except Exception as e:
+                    print(f"[data-analyzer] Failed to send heartbeat: {e}")
+                    # Health check will fail, Krill will restart us (up to 3 times)
+
+                # Sleep until the next iteration deadline so work time does not add drift
+                deadline += LOOP_PERIOD_NS
+                sleep_until(deadline, shutdown)
+
+        except Exception as e:
+            print(f"[data-analyzer] Error in main loop: {e}")
+            return 1
+
+        finally:
+            # Clean shutdown; leaving the with block closes the connection
+            print("[data-analyzer] Closing connection to Krill daemon")
+
+    print("[data-analyzer] Service stopped")
 
     return 0
 
@@ -12,22 +12,25 @@ It demonstrates:
 import os
 import signal
 import sys
+import threading
 import time
 
 # Add SDK to path (adjust path as needed)
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../../sdk/krill-python"))
 
-from krill import KrillClient
+from krill import KrillClient, sleep_until
 
-# Global flag for graceful shutdown
-shutdown_requested = False
+# Period between loop iterations, in nanoseconds
+LOOP_PERIOD_NS = 1_000_000_000
+
+# Set on SIGTERM/SIGINT; also wakes the loop from its sleep between iterations
+shutdown = threading.Event()
 
 
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully."""
-    global shutdown_requested
     print(f"\n[data-processor] Received signal {signum}, shutting down gracefully...")
-    shutdown_requested = True
+    shutdown.set()
 
 
 def process_data(iteration):
@@ -48,47 +51,51 @@ def main():
 
     # Connect to Krill daemon
     try:
-        client = KrillClient("data-processor")
-        print("[data-processor] Connected to Krill daemon")
+        if "KRILL_FD" in os.environ:
+            # Reuse a daemon connection handed down by the launcher
+            client = KrillClient.from_fd("data-processor", int(os.environ["KRILL_FD"]))
+        else:
+            client = KrillClient("data-processor")
+        print("[data-processor] Krill client ready (connects on first heartbeat)")
+        # The metadata keys never change, so encode the message layout once
+        emit_heartbeat = client.make_heartbeat_emitter("iteration", "processed_items")
     except Exception as e:
-        print(f"[data-processor] Failed to connect to Krill daemon: {e}")
+        print(f"[data-processor] Failed to create Krill client: {e}")
         return 1
 
     iteration = 0
-
-    try:
-        while not shutdown_requested:
-            iteration += 1
-
-            # Simulate data processing
-            result = process_data(iteration)
-
-            # Send heartbeat to Krill daemon
-            try:
-                client.heartbeat_with_metadata(
-                    {
-                        "iteration": str(iteration),
-                        "processed_items": str(result["processed_items"]),
-                    }
-                )
-                print(f"[data-processor] Heartbeat sent (iteration {iteration})")
-            except Exception as e:
-                print(f"[data-processor] Failed to send heartbeat: {e}")
-                # If we can't send heartbeats, the health check will fail
-                # and Krill will restart us (always-restart policy)
-
-            # Sleep between iterations
-            time.sleep(1)
-
-    except Exception as e:
-        print(f"[data-processor] Error in main loop: {e}")
-        return 1
-
-    finally:
-        # Clean shutdown
-        print("[data-processor] Closing connection to Krill daemon")
-        client.close()
-        print("[data-processor] Service stopped")
+    deadline = time.monotonic_ns()
+
+    with client:
+        try:
+            while not shutdown.is_set():
+                iteration += 1
+
+                # Simulate data processing
+                result = process_data(iteration)
+
+                # Send heartbeat to Krill daemon
+                try:
+                    emit_heartbeat(str(iteration), str(result["processed_items"]))
+                    print(f"[data-processor] Heartbeat sent (iteration {iteration})")
+                except Exception as e:
+                    print(f"[data-processor] Failed to send heartbeat: {e}")
+                    # If we can't send heartbeats, the health check will fail
+                    # and Krill will restart us (always-restart policy)
+
+                # Sleep until the next iteration deadline so work time does not add drift
+                deadline += LOOP_PERIOD_NS
+                sleep_until(deadline, shutdown)
+
+        except Exception as e:
+            print(f"[data-processor] Error in main loop: {e}")
+            return 1
+
+        finally:
+            # Clean shutdown; leaving the with block closes the connection
+            print("[data-processor] Closing connection to Krill daemon")
+
+    print("[data-processor] Service stopped")
 
     return 0
 
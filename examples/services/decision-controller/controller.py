@@ -13,24 +13,27 @@ It demonstrates:
 import os
 import signal
 import sys
+import threading
 import time
 
 # Add SDK to path (adjust path as needed)
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../../sdk/krill-python"))
 
-from krill import KrillClient
+from krill import KrillClient, sleep_until
 
-# Global flag for graceful shutdown
-shutdown_requested = False
+# Period between loop iterations, in nanoseconds
+LOOP_PERIOD_NS = 1_000_000_000
+
+# Set on SIGTERM/SIGINT; also wakes the loop from its sleep between iterations
+shutdown = threading.Event()
 
 
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully."""
-    global shutdown_requested
     print(
         f"\n[decision-controller] Received signal {signum}, shutting down gracefully..."
     )
-    shutdown_requested = True
+    shutdown.set()
 
 
 def make_decision(iteration):
@@ -64,54 +67,61 @@ def main():
 
     # Connect to Krill daemon
     try:
-        client = KrillClient("decision-controller")
-        print("[decision-controller] Connected to Krill daemon")
+        if "KRILL_FD" in os.environ:
+            # Reuse a daemon connection handed down by the launcher
+            client = KrillClient.from_fd("decision-controller", int(os.environ["KRILL_FD"]))
+        else:
+            client = KrillClient("decision-controller")
+        print("[decision-controller] Krill client ready (connects on first heartbeat)")
     except Exception as e:
-        print(f"[decision-controller] Failed to connect to Krill daemon: {e}")
+        print(f"[decision-controller] Failed to create Krill client: {e}")
         return 1
 
     iteration = 0
-
-    try:
-        while not shutdown_requested:
-            iteration += 1
-
-            # Make control decisions
-            decision = make_decision(iteration)
-
-            # Send heartbeat with decision metadata
-            try:
-                client.heartbeat_with_metadata(
-                    {
-                        "cycle": str(iteration),
-                        "action": decision["action"],
-                        "confidence": str(decision["confidence"]),
-                    }
-                )
-                print(
-                    f"[decision-controller] ✓ Decision: {decision['action']} "
-                    f"(confidence: {decision['confidence']:.2f}, cycle {iteration})"
-                )
-            except Exception as e:
-                print(f"[decision-controller] Failed to send heartbeat: {e}")
-                # As a critical service, if health checks fail after max retries,
-                # Krill will trigger emergency stop of all services
-
-            # Sleep between control cycles
-            time.sleep(1)
-
-    except Exception as e:
-        print(f"[decision-controller] ERROR in main loop: {e}")
-        print(
-            "[decision-controller] Critical service failure - emergency stop will be triggered"
-        )
-        return 1
-
-    finally:
-        # Clean shutdown
-        print("[decision-controller] Closing connection to Krill daemon")
-        client.close()
-        print("[decision-controller] Service stopped")
+    deadline = time.monotonic_ns()
+
+    with client:
+        try:
+            while not shutdown.is_set():
+                iteration += 1
+
+                # Make control decisions
+                decision = make_decision(iteration)
+
+                # Send heartbeat with decision metadata
+                try:
+                    client.heartbeat_with_metadata(
+                        {
+                            "cycle": str(iteration),
+                            "action": decision["action"],
+                            "confidence": str(decision["confidence"]),
+                        }
+                    )
+                    print(
+                        f"[decision-controller] ✓ Decision: {decision['action']} "
+                        f"(confidence: {decision['confidence']:.2f}, cycle {iteration})"
+                    )
+                except Exception as e:
+                    print(f"[decision-controller] Failed to send heartbeat: {e}")
+                    # As a critical service, if health checks fail after max retries,
+                    # Krill will trigger emergency stop of all services
+
+                # Sleep until the next cycle deadline so work time does not add drift
+                deadline += LOOP_PERIOD_NS
+                sleep_until(deadline, shutdown)
+
+        except Exception as e:
+            print(f"[decision-controller] ERROR in main loop: {e}")
+            print(
+                "[decision-controller] Critical service failure - emergency stop will be triggered"
+            )
+            return 1
+
+        finally:
+            # Clean shutdown; leaving the with block closes the connection
+            print("[decision-controller] Closing connection to Krill daemon")
+
+    print("[decision-controller] Service stopped")
 
     return 0
 
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Multiplexed Services - Example Krill Service
+
+Runs the data-processor, data-analyzer and decision-controller loops as
+coroutines in a single asyncio process instead of three interpreters.
+It demonstrates:
+- Several services sharing one process and one daemon connection
+- Per-service heartbeats with AsyncKrillClient.for_service
+- Graceful shutdown of every loop on SIGTERM/SIGINT
+"""
+
+import asyncio
+import os
+import signal
+import sys
+
+# Add SDK to path (adjust path as needed)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../sdk/krill-python"))
+
+from krill import AsyncKrillClient
+
+# Period between loop iterations, in seconds
+LOOP_PERIOD = 1.0
+
+
+async def wait_until(stop, deadline):
+    """Sleep until the loop-time deadline, returning early on shutdown."""
+    timeout = max(0.0, deadline - asyncio.get_running_loop().time())
+    try:
+        await asyncio.wait_for(stop.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+
+
+async def run_processor(client, stop):
+    """Data processor loop (see data-processor/processor.py)."""
+    iteration = 0
+    deadline = asyncio.get_running_loop().time()
+
+    while not stop.is_set():
+        iteration += 1
+
+        print(f"[data-processor] Processing sensor data batch {iteration}")
+        await asyncio.sleep(0.5)
+
+        try:
+            await client.heartbeat_with_metadata(
+                {"iteration": str(iteration), "processed_items": str(iteration * 10)}
+            )
+            print(f"[data-processor] Heartbeat sent (iteration {iteration})")
+        except Exception as e:
+            print(f"[data-processor] Failed to send heartbeat: {e}")
+
+        deadline += LOOP_PERIOD
+        await wait_until(stop, deadline)
+
+
+async def run_analyzer(client, stop):
+    """Data analyzer loop (see data-analyzer/analyzer.py)."""
+    iteration = 0
+    deadline = asyncio.get_running_loop().time()
+
+    while not stop.is_set():
+        iteration += 1
+
+        print(f"[data-analyzer] Analyzing data batch {iteration}")
+        await asyncio.sleep(0.7)
+
+        try:
+            if iteration % 10 == 0:
+                # Report degraded status when anomalies detected
+                await client.report_degraded("Detected 2 anomalies")
+                print(f"[data-analyzer] ⚠️  Degraded: 2 anomalies in batch {iteration}")
+            else:
+                await client.heartbeat_with_metadata(
+                    {"iteration": str(iteration), "status": "normal"}
+                )
+                print(f"[data-analyzer] ✓ Healthy (batch {iteration})")
+        except Exception as e:
+            print(f"[data-analyzer] Failed to send heartbeat: {e}")
+
+        deadline += LOOP_PERIOD
+        await wait_until(stop, deadline)
+
+
+async def run_controller(client, stop):
+    """Decision controller loop (see decision-controller/controller.py)."""
+    iteration = 0
+    deadline = asyncio.get_running_loop().time()
+
+    while not stop.is_set():
+        iteration += 1
+
+        print(f"[decision-controller] Computing control decisions for cycle {iteration}")
+        await asyncio.sleep(0.3)
+
+        if iteration % 15 == 0:
+            action, confidence = "brake", 0.85
+        elif iteration % 5 == 0:
+            action, confidence = "turn", 0.92
+        else:
+            action, confidence = "forward", 0.98
+
+        try:
+            await client.heartbeat_with_metadata(
+                {
+                    "cycle": str(iteration),
+                    "action": action,
+                    "confidence": str(confidence),
+                }
+            )
+            print(
+                f"[decision-controller] ✓ Decision: {action} "
+                f"(confidence: {confidence:.2f}, cycle {iteration})"
+            )
+        except Exception as e:
+            print(f"[decision-controller] Failed to send heartbeat: {e}")
+
+        deadline += LOOP_PERIOD
+        await wait_until(stop, deadline)
+
+
+async def main():
+    """Run all three service loops until a shutdown signal arrives."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stop.set)
+
+    print("[multiplex] Starting data-processor, data-analyzer and decision-controller...")
+
+    # One daemon connection, shared by all three services
+    try:
+        client = await AsyncKrillClient.connect("data-processor")
+        print("[multiplex] Connected to Krill daemon")
+    except Exception as e:
+        print(f"[multiplex] Failed to connect to Krill daemon: {e}")
+        return 1
+
+    async with client:
+        await asyncio.gather(
+            run_processor(client, stop),
+            run_analyzer(client.for_service("data-analyzer"), stop),
+            run_controller(client.for_service("decision-controller"), stop),
+        )
+
+    print("[multiplex] Services stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -6,6 +6,7 @@ from .krill import (
     KrillClient,
     KrillError,
     SendError,
+    sleep_until,
 )
 
 __version__ = "0.1.0"
@@ -16,4 +17,5 @@ __all__ = [
     "KrillError",
     "ConnectionError",
     "SendError",
+    "sleep_until",
 ]
@@ -9,39 +9,35 @@ from krill import KrillClient
 def main():
     """Run the example."""
     try:
-        # Create a client for this service
-        client = KrillClient("vision-pipeline")
-
-        print("Starting vision pipeline heartbeat loop...")
-
-        # Main processing loop
-        for i in range(10):
-            # Simulate work
-            time.sleep(1)
-
-            # Send heartbeat
-            if i % 3 == 0:
-                # Every 3rd iteration, send with metadata
-                metadata = {"frame_count": str(i * 30), "fps": "29.7"}
-                client.heartbeat_with_metadata(metadata)
-                print(f"Sent heartbeat with metadata (iteration {i})")
-            else:
-                client.heartbeat()
-                print(f"Sent heartbeat (iteration {i})")
-
-        # Simulate degraded state
-        print("Simulating degraded state...")
-        client.report_degraded("High latency detected")
-        time.sleep(2)
-
-        # Recover
-        print("Recovered to healthy state")
-        client.report_healthy()
-
-        print("Example complete!")
-
-        # Clean up
-        client.close()
+        # Create a client for this service; the connection closes when the block exits
+        with KrillClient("vision-pipeline") as client:
+            print("Starting vision pipeline heartbeat loop...")
+
+            # Main processing loop
+            for i in range(10):
+                # Simulate work
+                time.sleep(1)
+
+                # Send heartbeat
+                if i % 3 == 0:
+                    # Every 3rd iteration, send with metadata
+                    metadata = {"frame_count": str(i * 30), "fps": "29.7"}
+                    client.heartbeat_with_metadata(metadata)
+                    print(f"Sent heartbeat with metadata (iteration {i})")
+                else:
+                    client.heartbeat()
+                    print(f"Sent heartbeat (iteration {i})")
+
+            # Simulate degraded state
+            print("Simulating degraded state...")
+            client.report_degraded("High latency detected")
+            time.sleep(2)
+
+            # Recover
+            print("Recovered to healthy state")
+            client.report_healthy()
+
+            print("Example complete!")
 
     except Exception as e:
         print(f"Error: {e}")
@@ -5,7 +5,8 @@
 Krill Python SDK
 
 Lightweight client for communicating with the Krill daemon over Unix sockets.
-Zero external dependencies - uses only the Python standard library.
+Zero external dependencies - uses only the Python standard library, and
+picks up orjson for faster metadata encoding when it is installed.
 
 Supports both synchronous and asynchronous (asyncio) usage.
 
@@ -25,15 +26,177 @@ Usage (async):
 from __future__ import annotations
 
 import asyncio
+import collections
+import contextlib
+import functools
 import json
 import socket
 import threading
-from typing import Dict, Optional
+import time
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
 
-__all__ = ["KrillClient", "AsyncKrillClient", "KrillError"]
+__all__ = ["KrillClient", "AsyncKrillClient", "KrillError", "sleep_until"]
 
 DEFAULT_SOCKET_PATH = "/tmp/krill.sock"
 
+# (level, option, value) triples applied to every new daemon connection
+SocketOptions = Sequence[Tuple[int, int, int]]
+
+DEFAULT_SOCKET_OPTIONS: SocketOptions = (
+    # Room for bursts of heartbeats without blocking on the daemon
+    (socket.SOL_SOCKET, socket.SO_SNDBUF, 262144),
+)
+
+_HEARTBEAT_TAIL = b"}\n"
+_REASON_TAIL = b"}" + _HEARTBEAT_TAIL
+
+# Largest message either client sends; a single AF_UNIX stream write of this
+# size reaches the daemon in one piece, so concurrent senders need no lock
+_MAX_MESSAGE_SIZE = 4096
+
+# Marks a degraded reason cut short to fit within _MAX_MESSAGE_SIZE
+_TRUNCATED = "... [truncated]"
+
+# Avoid SIGPIPE on a closed daemon connection where the platform supports it
+_SEND_FLAGS = getattr(socket, "MSG_NOSIGNAL", 0)
+
+# Delays between connection attempts while the daemon is unreachable
+_CONNECT_RETRY_DELAYS = (0.05, 0.1, 0.25, 0.5, 1.0)
+
+# AsyncKrillClient only waits for the socket once this many bytes are buffered
+_DRAIN_THRESHOLD = 8 * 1024
+
+# Clients handed out by KrillClient.from_pool, keyed by (service, socket path)
+_CLIENT_POOL: Dict[Tuple[str, str], KrillClient] = {}
+_CLIENT_POOL_LOCK = threading.Lock()
+
+
+# Escapes lone surrogates (e.g. from surrogateescape-decoded paths), which
+# have no UTF-8 encoding, as \udcxx
+_JSON_ENCODE_ASCII = json.JSONEncoder(separators=(",", ":")).encode
+
+try:
+    # Optional accelerator; produces the same compact UTF-8 JSON as below.
+    # OPT_NON_STR_KEYS coerces keys such as 1 or None to strings like json does
+    from orjson import OPT_NON_STR_KEYS, dumps as _orjson_dumps
+
+    def _encode_json(value: object) -> bytes:
+        try:
+            return _orjson_dumps(value, option=OPT_NON_STR_KEYS)
+        except TypeError as exc:
+            # orjson rejects lone surrogates; anything else fails below too
+            try:
+                return _JSON_ENCODE_ASCII(value).encode("ascii")
+            except (TypeError, ValueError):
+                raise exc from None
+
+except ImportError:
+    # json.dumps builds a new JSONEncoder per call when given options; reuse one
+    _JSON_ENCODE = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+    def _encode_json(value: object) -> bytes:
+        try:
+            return _JSON_ENCODE(value).encode("utf-8")
+        except UnicodeEncodeError:
+            return _JSON_ENCODE_ASCII(value).encode("ascii")
+
+
+def _encode_str(value: str) -> bytes:
+    # Typical metadata values need no escaping, so skip the JSON encoder for them
+    if value.isprintable() and '"' not in value and "\\" not in value:
+        return b'"' + value.encode("utf-8") + b'"'
+    return _encode_json(value)
+
+
+@functools.lru_cache(maxsize=128)
+def _encode_items(items: Tuple[Tuple[str, str], ...]) -> bytes:
+    return _encode_json(dict(items))
+
+
+def _encode_metadata(metadata: Dict[str, str]) -> bytes:
+    # Services tend to repeat the same metadata, so reuse recent encodings;
+    # items() keeps key order, making the result identical to an uncached call
+    items = tuple(metadata.items())
+    for key, value in items:
+        # Equal but differently encoded entries (1, 1.0, True) would share a
+        # cache slot, so only plain-str metadata is cached
+        if type(key) is not str or type(value) is not str:
+            return _encode_json(metadata)
+    return _encode_items(items)
+
+
+def _encode_reason(reason: str, limit: int) -> bytes:
+    """Encode a degraded reason as a JSON string of at most ``limit`` bytes.
+
+    An over-long reason, such as a full traceback, is cut short and marked so
+    the degraded report still reaches the daemon.
+    """
+    encoded = _encode_str(reason)
+    if len(encoded) <= limit:
+        return encoded
+    # Binary search for the longest prefix that fits alongside the marker;
+    # every character encodes to at least one byte
+    low, high = 0, min(len(reason), limit)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if len(_encode_str(reason[:middle] + _TRUNCATED)) <= limit:
+            low = middle
+        else:
+            high = middle - 1
+    return _encode_str(reason[:low] + _TRUNCATED)
+
+
+def _check_message_size(buffers: Sequence[bytes]) -> int:
+    size = sum(map(len, buffers))
+    if size > _MAX_MESSAGE_SIZE:
+        raise SendError(
+            f"Heartbeat message is {size} bytes, "
+            f"exceeding the {_MAX_MESSAGE_SIZE} byte limit"
+        )
+    return size
+
+
+def _heartbeat_head(service_name: str, status: str) -> bytes:
+    """Encode a heartbeat message up to (not including) its metadata value.
+
+    The type, service and status fields never change for a given client, so
+    the envelope is built once and the metadata is spliced in per message.
+    """
+    return (
+        b'{"type":"heartbeat","service":'
+        + _encode_json(service_name)
+        + b',"status":'
+        + _encode_json(status)
+        + b',"metadata":'
+    )
+
+
+def _apply_socket_options(sock: socket.socket, options: SocketOptions) -> None:
+    for level, option, value in options:
+        sock.setsockopt(level, option, value)
+
+
+def sleep_until(deadline_ns: int, stop: Optional[threading.Event] = None) -> bool:
+    """Sleep until ``time.monotonic_ns()`` reaches ``deadline_ns``.
+
+    Sleeping to an absolute deadline keeps a periodic loop on its cadence no
+    matter how long each iteration's work takes. Returns immediately if the
+    deadline has already passed.
+
+    A plain sleep resumes after a signal handler returns, so a shutdown
+    signal alone does not end it early. Pass a ``stop`` event and set it from
+    the handler to wake as soon as shutdown is requested.
+
+    Returns:
+        True if ``stop`` is set, False once the deadline is reached.
+    """
+    remaining = max(deadline_ns - time.monotonic_ns(), 0) / 1_000_000_000
+    if stop is not None:
+        return stop.wait(remaining)
+    if remaining:
+        time.sleep(remaining)
+    return False
+
 
 class KrillError(Exception):
     """Base exception for Krill SDK errors."""
@@ -56,70 +219,252 @@ class SendError(KrillError):
 class KrillClient:
     """Synchronous client for sending heartbeats to the Krill daemon.
 
-    Thread-safe: the underlying socket is protected by a lock.
+    The connection is opened on the first send rather than in the
+    constructor, so a service can start before the daemon is ready. If a
+    send fails, the next one reconnects.
+
+    Thread-safe: each message is written with a single ``sendmsg()`` call,
+    so concurrent heartbeats never interleave. The lock only guards
+    replacing and closing the socket.
+
+    The client is not closed on garbage collection; use it as a context
+    manager or call ``close()``.
 
     Args:
         service_name: The name of the service this client represents.
         socket_path: Path to the Krill daemon Unix socket.
+        socket_options: ``(level, option, value)`` triples passed to
+            ``setsockopt`` before connecting. Defaults to
+            ``DEFAULT_SOCKET_OPTIONS``.
     """
 
     def __init__(
         self,
         service_name: str,
         socket_path: str = DEFAULT_SOCKET_PATH,
+        socket_options: Optional[SocketOptions] = None,
     ) -> None:
         self._service_name = service_name
         self._socket_path = socket_path
+        self._socket_options = (
+            DEFAULT_SOCKET_OPTIONS if socket_options is None else socket_options
+        )
+        self._healthy_head = _heartbeat_head(service_name, "healthy")
+        self._healthy_empty = self._healthy_head + b"{}" + _HEARTBEAT_TAIL
+        self._reason_head = _heartbeat_head(service_name, "degraded") + b'{"reason":'
+        self._reason_limit = (
+            _MAX_MESSAGE_SIZE - len(self._reason_head) - len(_REASON_TAIL)
+        )
         self._lock = threading.Lock()
         self._sock: Optional[socket.socket] = None
-        self._connect()
+        self._batch: Optional[List[Tuple[bytes, ...]]] = None
+        self._closed = False
+        self._pool_key: Optional[Tuple[str, str]] = None
+
+    @classmethod
+    def from_fd(
+        cls,
+        service_name: str,
+        fd: int,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        socket_options: Optional[SocketOptions] = None,
+    ) -> KrillClient:
+        """Create a client on an already-connected daemon socket.
+
+        Lets a launcher open a single connection to the daemon and hand the
+        file descriptor to each service it starts, instead of every service
+        connecting on its own. If that connection is lost, the client
+        reconnects to ``socket_path``.
+
+        Args:
+            service_name: The name of the service this client represents.
+            fd: File descriptor of a Unix stream socket connected to the
+                daemon. The client takes ownership and closes it on ``close()``.
+            socket_path: Path to the Krill daemon Unix socket, used to
+                reconnect.
+            socket_options: ``(level, option, value)`` triples passed to
+                ``setsockopt`` when reconnecting. Defaults to
+                ``DEFAULT_SOCKET_OPTIONS``.
+        """
+        client = cls(service_name, socket_path, socket_options)
+        client._sock = socket.socket(fileno=fd)
+        # The fd may arrive non-blocking, which sendmsg() would surface as
+        # BlockingIOError on a full buffer; match the mode _connect() uses
+        client._sock.setblocking(True)
+        return client
+
+    @classmethod
+    def from_pool(
+        cls, service_name: str, socket_path: str = DEFAULT_SOCKET_PATH
+    ) -> KrillClient:
+        """Return the process-wide client for a service and socket path.
 
-    def _connect(self) -> None:
-        import time
+        Code that reports for the same service from several places shares
+        one client, and so one daemon connection, instead of each opening
+        its own. ``close()`` removes the client from the pool; the next call
+        creates a new one.
 
-        max_retries = 10
-        retry_delay = 0.5  # seconds
+        Args:
+            service_name: The name of the service this client represents.
+            socket_path: Path to the Krill daemon Unix socket.
+        """
+        key = (service_name, socket_path)
+        with _CLIENT_POOL_LOCK:
+            client = _CLIENT_POOL.get(key)
+            if client is None:
+                client = cls(service_name, socket_path)
+                client._pool_key = key
+                _CLIENT_POOL[key] = client
+            return client
+
+    def _ensure_connected(self) -> socket.socket:
+        with self._lock:
+            if self._closed:
+                raise SendError("Not connected to daemon")
+            if self._sock is None:
+                self._sock = self._connect()
+            return self._sock
 
-        for attempt in range(max_retries):
+    def _connect(self) -> socket.socket:
+        attempts = len(_CONNECT_RETRY_DELAYS) + 1
+
+        for attempt in range(attempts):
+            sock = None
             try:
+                # Created inside the try so errors such as EMFILE also
+                # surface as ConnectionError
                 sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                _apply_socket_options(sock, self._socket_options)
                 sock.settimeout(2.0)  # 2 second connection timeout
                 sock.connect(self._socket_path)
                 sock.settimeout(None)  # Remove timeout after connection
-                self._sock = sock
-                return
-            except (OSError, socket.timeout) as exc:
-                if attempt == max_retries - 1:
+                return sock
+            except OSError as exc:
+                if sock is not None:
+                    sock.close()
+                if attempt == attempts - 1:
                     # Last attempt failed
                     raise ConnectionError(
-                        f"Failed to connect to daemon at {self._socket_path} after {max_retries} attempts: {exc}"
+                        f"Failed to connect to daemon at {self._socket_path} after {attempts} attempts: {exc}"
                     ) from exc
-                # Retry after delay
-                time.sleep(retry_delay)
+                # Back off before retrying, the daemon may still be starting
+                time.sleep(_CONNECT_RETRY_DELAYS[attempt])
             except Exception as exc:
+                if sock is not None:
+                    sock.close()
                 raise ConnectionError(
                     f"Unexpected error connecting to daemon at {self._socket_path}: {exc}"
                 ) from exc
 
     def heartbeat(self) -> None:
         """Send a healthy heartbeat to the daemon."""
-        self._send_heartbeat("healthy", {})
+        self._send(self._healthy_empty)
 
     def heartbeat_with_metadata(self, metadata: Dict[str, str]) -> None:
-        """Send a healthy heartbeat with custom metadata."""
-        self._send_heartbeat("healthy", metadata)
+        """Send a healthy heartbeat with custom metadata.
+
+        Raises:
+            SendError: If the encoded message exceeds 4096 bytes.
+        """
+        if not metadata:
+            self._send(self._healthy_empty)
+        else:
+            self._send(self._healthy_head, _encode_metadata(metadata), _HEARTBEAT_TAIL)
+
+    def heartbeat_kv(self, *pairs: Tuple[bytes, bytes]) -> None:
+        """Send a healthy heartbeat with pre-encoded metadata pairs.
+
+        Each pair is a JSON-encoded key and value, e.g. ``(b'"fps"', b'"29.7"')``,
+        and is written into the message as-is. Both must be JSON strings, as
+        the daemon only accepts string metadata. Avoids building and encoding
+        a dict when the caller already has the encoded bytes.
+        """
+        body = b",".join(key + b":" + value for key, value in pairs)
+        self._send(self._healthy_head, b"{" + body + b"}", _HEARTBEAT_TAIL)
 
     def report_degraded(self, reason: str) -> None:
-        """Report degraded status with a reason."""
-        self._send_heartbeat("degraded", {"reason": reason})
+        """Report degraded status with a reason.
+
+        A reason too long for the 4096-byte message limit is truncated.
+        """
+        self._send(
+            self._reason_head,
+            _encode_reason(reason, self._reason_limit),
+            _REASON_TAIL,
+        )
 
     def report_healthy(self) -> None:
         """Report healthy status (alias for heartbeat)."""
-        self._send_heartbeat("healthy", {})
+        self._send(self._healthy_empty)
+
+    def make_heartbeat_emitter(self, *keys: str) -> Callable[..., None]:
+        """Return a function that sends healthy heartbeats with fixed metadata keys.
+
+        The message layout is encoded once, so each call only encodes the
+        values. Useful for services that report the same fields every cycle:
+
+            emit = client.make_heartbeat_emitter("iteration", "fps")
+            emit("42", "29.7")
+
+        Args:
+            *keys: Metadata keys, in the order their values will be passed.
+        """
+        # Literal "%" in the service name or keys must not become format slots
+        head = self._healthy_head.replace(b"%", b"%%")
+        fields = b",".join(
+            _encode_json(key).replace(b"%", b"%%") + b":%s" for key in keys
+        )
+        template = head + b"{" + fields + b"}" + _HEARTBEAT_TAIL
+        send = self._send
+
+        def emit(*values: str) -> None:
+            if len(values) != len(keys):
+                raise TypeError(f"expected {len(keys)} values, got {len(values)}")
+            send(template % tuple(_encode_str(value) for value in values))
+
+        return emit
+
+    @contextlib.contextmanager
+    def batched(self) -> Iterator[None]:
+        """Queue messages sent inside the block and write them together on exit.
+
+        Bursts of heartbeats and status reports then cost one ``sendmsg()``
+        call per 4 KiB of messages instead of one call each. While a batch is
+        open, messages from any thread using this client are queued.
+
+            with client.batched():
+                client.heartbeat_with_metadata({"scan": "1"})
+                client.report_degraded("lidar dropout")
+        """
+        with self._lock:
+            nested = self._batch is not None
+            if not nested:
+                self._batch = []
+        try:
+            yield
+        finally:
+            if not nested:
+                with self._lock:
+                    batch, self._batch = self._batch, None
+                self._write_batch(batch)
+
+    def flush(self) -> None:
+        """Write any messages queued by an open ``batched()`` block now."""
+        with self._lock:
+            batch = self._batch
+            if not batch:
+                return
+            self._batch = []
+        self._write_batch(batch)
 
     def close(self) -> None:
         """Close the connection to the daemon."""
+        if self._pool_key is not None:
+            with _CLIENT_POOL_LOCK:
+                if _CLIENT_POOL.get(self._pool_key) is self:
+                    del _CLIENT_POOL[self._pool_key]
         with self._lock:
+            self._closed = True
             if self._sock is not None:
                 try:
                     self._sock.close()
@@ -127,23 +472,51 @@ class KrillClient:
                     pass
                 self._sock = None
 
-    def _send_heartbeat(self, status: str, metadata: Dict[str, str]) -> None:
-        message = {
-            "type": "heartbeat",
-            "service": self._service_name,
-            "status": status,
-            "metadata": metadata,
-        }
-        line = json.dumps(message, separators=(",", ":")) + "\n"
-        data = line.encode("utf-8")
-
-        with self._lock:
-            if self._sock is None:
-                raise SendError("Not connected to daemon")
+    def _send(self, *buffers: bytes) -> None:
+        # A message arrives in parts (cached head, encoded body, tail), which
+        # sendmsg() gathers from separate buffers without joining them first
+        size = _check_message_size(buffers)
+
+        if self._batch is not None:
+            with self._lock:
+                if self._batch is not None:
+                    self._batch.append(buffers)
+                    return
+        self._write(buffers, size)
+
+    def _write_batch(self, batch: List[Tuple[bytes, ...]]) -> None:
+        # Group whole messages into writes that stay within the atomic size
+        buffers: List[bytes] = []
+        size = 0
+        for message in batch:
+            message_size = sum(map(len, message))
+            if size + message_size > _MAX_MESSAGE_SIZE:
+                self._write(buffers, size)
+                buffers, size = [], 0
+            buffers.extend(message)
+            size += message_size
+        if buffers:
+            self._write(buffers, size)
+
+    def _write(self, buffers: Sequence[bytes], size: int) -> None:
+        sock = self._sock
+        if sock is None:
+            sock = self._ensure_connected()
+        try:
+            sent = sock.sendmsg(buffers, [], _SEND_FLAGS)
+            if sent < size:
+                # Only happens when a signal interrupts the write
+                sock.sendall(b"".join(buffers)[sent:], _SEND_FLAGS)
+        except OSError as exc:
+            with self._lock:
+                if self._sock is sock:
+                    self._sock = None
             try:
-                self._sock.sendall(data)
-            except OSError as exc:
-                raise SendError(f"Failed to send heartbeat: {exc}") from exc
+                sock.close()
+            except OSError:
+                pass
+            # The next send reconnects
+            raise SendError(f"Failed to send heartbeat: {exc}") from exc
 
     def __enter__(self) -> KrillClient:
         return self
@@ -151,8 +524,161 @@ class KrillClient:
     def __exit__(self, *args: object) -> None:
         self.close()
 
-    def __del__(self) -> None:
-        self.close()
+
+class _KrillProtocol(asyncio.Protocol):
+    """Write-only protocol for a daemon connection, with flow control."""
+
+    def __init__(self) -> None:
+        self.transport: Optional[asyncio.WriteTransport] = None
+        self.paused = False
+        # Every sender sharing the connection may be waiting at once
+        self._drain_waiters: Deque[asyncio.Future] = collections.deque()
+        self._closed = asyncio.get_running_loop().create_future()
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+
+    def data_received(self, data: bytes) -> None:
+        # The daemon broadcasts status events to every client; heartbeat
+        # senders have no use for them
+        pass
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if not self._closed.done():
+            self._closed.set_result(None)
+        self._wake_writers(exc or ConnectionResetError("Connection lost"))
+
+    def pause_writing(self) -> None:
+        self.paused = True
+
+    def resume_writing(self) -> None:
+        self.paused = False
+        self._wake_writers(None)
+
+    async def drain(self) -> None:
+        if self._closed.done():
+            raise ConnectionResetError("Connection lost")
+        if not self.paused:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._drain_waiters.append(waiter)
+        try:
+            await waiter
+        finally:
+            self._drain_waiters.remove(waiter)
+
+    async def wait_closed(self) -> None:
+        await self._closed
+
+    def _wake_writers(self, exc: Optional[Exception]) -> None:
+        for waiter in self._drain_waiters:
+            if waiter.done():
+                continue
+            if exc is None:
+                waiter.set_result(None)
+            else:
+                waiter.set_exception(exc)
+
+
+class _AsyncConnection:
+    """Daemon connection shared by an AsyncKrillClient and its ``for_service`` clients.
+
+    Messages queued during one event loop iteration are coalesced into a
+    single transport write, and the sender only waits once the transport
+    buffer passes its high-water mark. A sender that never yields flushes
+    early, so the queue itself stays under that mark. A lost connection is
+    re-established on the next send.
+    """
+
+    def __init__(self, socket_path: str, socket_options: SocketOptions) -> None:
+        self._socket_path = socket_path
+        self._socket_options = socket_options
+        self._protocol: Optional[_KrillProtocol] = None
+        self._reconnect_lock = asyncio.Lock()
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+        self._flush_scheduled = False
+        self._closed = False
+
+    async def connect(self) -> None:
+        attempts = len(_CONNECT_RETRY_DELAYS) + 1
+
+        for attempt in range(attempts):
+            try:
+                self._protocol = await self._open()
+                return
+            except OSError as exc:
+                if attempt == attempts - 1:
+                    raise ConnectionError(
+                        f"Failed to connect to daemon at {self._socket_path} after {attempts} attempts: {exc}"
+                    ) from exc
+                # Back off before retrying, the daemon may still be starting
+                await asyncio.sleep(_CONNECT_RETRY_DELAYS[attempt])
+
+    async def _open(self) -> _KrillProtocol:
+        loop = asyncio.get_running_loop()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            _apply_socket_options(sock, self._socket_options)
+            sock.setblocking(False)
+            await loop.sock_connect(sock, self._socket_path)
+            transport, protocol = await loop.create_unix_connection(
+                _KrillProtocol, sock=sock
+            )
+        except OSError:
+            sock.close()
+            raise
+        transport.set_write_buffer_limits(high=_DRAIN_THRESHOLD)
+        return protocol
+
+    async def send(self, buffers: Sequence[bytes]) -> None:
+        if self._closed:
+            raise SendError("Not connected to daemon")
+
+        protocol = self._protocol
+        if protocol is None or protocol.transport.is_closing():
+            protocol = await self._reconnect()
+
+        self._pending.extend(buffers)
+        self._pending_size += sum(map(len, buffers))
+        if self._pending_size >= _DRAIN_THRESHOLD:
+            # Hand the data to the transport now so its flow control sees it
+            self._flush()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+
+        if protocol.paused:
+            try:
+                await protocol.drain()
+            except OSError as exc:
+                raise SendError(f"Failed to send heartbeat: {exc}") from exc
+
+    async def _reconnect(self) -> _KrillProtocol:
+        async with self._reconnect_lock:
+            protocol = self._protocol
+            if protocol is None or protocol.transport.is_closing():
+                # Anything still queued was meant for the lost connection
+                self._pending.clear()
+                self._pending_size = 0
+                await self.connect()
+            return self._protocol
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self._pending_size = 0
+            # Gathered into a single sendmsg() on Python 3.12+, joined before
+            self._protocol.transport.writelines(pending)
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._protocol is None:
+            return
+        self._flush()
+        self._protocol.transport.close()
+        await self._protocol.wait_closed()
 
 
 class AsyncKrillClient:
@@ -161,32 +687,43 @@ class AsyncKrillClient:
     Uses asyncio for non-blocking I/O. Not thread-safe - use from a single
     asyncio event loop.
 
+    Messages are written straight to an asyncio transport, without the
+    StreamWriter layer. Messages sent within the same event loop iteration
+    are coalesced into a single write, and a send only waits when the socket
+    is backed up. If the connection is lost, the next send reconnects.
+
     Use the ``connect`` classmethod to create instances:
 
         client = await AsyncKrillClient.connect("my-service")
     """
 
-    def __init__(
-        self,
-        service_name: str,
-        reader: asyncio.StreamReader,
-        writer: asyncio.StreamWriter,
-    ) -> None:
+    def __init__(self, service_name: str, connection: _AsyncConnection) -> None:
         self._service_name = service_name
-        self._reader = reader
-        self._writer = writer
+        self._healthy_head = _heartbeat_head(service_name, "healthy")
+        self._healthy_empty = self._healthy_head + b"{}" + _HEARTBEAT_TAIL
+        self._reason_head = _heartbeat_head(service_name, "degraded") + b'{"reason":'
+        self._reason_limit = (
+            _MAX_MESSAGE_SIZE - len(self._reason_head) - len(_REASON_TAIL)
+        )
+        self._connection = connection
 
     @classmethod
     async def connect(
         cls,
         service_name: str,
         socket_path: str = DEFAULT_SOCKET_PATH,
+        socket_options: Optional[SocketOptions] = None,
     ) -> AsyncKrillClient:
         """Connect to the Krill daemon.
 
+        Retries with a short backoff while the daemon is unreachable.
+
         Args:
             service_name: The name of the service this client represents.
             socket_path: Path to the Krill daemon Unix socket.
+            socket_options: ``(level, option, value)`` triples passed to
+                ``setsockopt`` before connecting. Defaults to
+                ``DEFAULT_SOCKET_OPTIONS``.
 
         Returns:
             A connected AsyncKrillClient instance.
@@ -194,53 +731,60 @@ class AsyncKrillClient:
         Raises:
             ConnectionError: If the connection fails.
         """
-        try:
-            reader, writer = await asyncio.open_unix_connection(socket_path)
-        except OSError as exc:
-            raise ConnectionError(
-                f"Failed to connect to daemon at {socket_path}: {exc}"
-            ) from exc
-        return cls(service_name, reader, writer)
+        if socket_options is None:
+            socket_options = DEFAULT_SOCKET_OPTIONS
+
+        connection = _AsyncConnection(socket_path, socket_options)
+        await connection.connect()
+        return cls(service_name, connection)
+
+    def for_service(self, service_name: str) -> AsyncKrillClient:
+        """Return a client for another service that shares this connection.
+
+        Lets several services running in one process report over a single
+        daemon connection. Closing any of the clients closes the connection.
+        """
+        return type(self)(service_name, self._connection)
 
     async def heartbeat(self) -> None:
         """Send a healthy heartbeat to the daemon."""
-        await self._send_heartbeat("healthy", {})
+        await self._send(self._healthy_empty)
 
     async def heartbeat_with_metadata(self, metadata: Dict[str, str]) -> None:
-        """Send a healthy heartbeat with custom metadata."""
-        await self._send_heartbeat("healthy", metadata)
+        """Send a healthy heartbeat with custom metadata.
+
+        Raises:
+            SendError: If the encoded message exceeds 4096 bytes.
+        """
+        if not metadata:
+            await self._send(self._healthy_empty)
+        else:
+            await self._send(
+                self._healthy_head, _encode_metadata(metadata), _HEARTBEAT_TAIL
+            )
 
     async def report_degraded(self, reason: str) -> None:
-        """Report degraded status with a reason."""
-        await self._send_heartbeat("degraded", {"reason": reason})
+        """Report degraded status with a reason.
+
+        A reason too long for the 4096-byte message limit is truncated.
+        """
+        await self._send(
+            self._reason_head,
+            _encode_reason(reason, self._reason_limit),
+            _REASON_TAIL,
+        )
 
     async def report_healthy(self) -> None:
         """Report healthy status."""
-        await self._send_heartbeat("healthy", {})
+        await self._send(self._healthy_empty)
 
     async def close(self) -> None:
         """Close the connection to the daemon."""
-        try:
-            self._writer.close()
-            await self._writer.wait_closed()
-        except OSError:
-            pass
-
-    async def _send_heartbeat(self, status: str, metadata: Dict[str, str]) -> None:
-        message = {
-            "type": "heartbeat",
-            "service": self._service_name,
-            "status": status,
-            "metadata": metadata,
-        }
-        line = json.dumps(message, separators=(",", ":")) + "\n"
-        data = line.encode("utf-8")
+        await self._connection.close()
 
-        try:
-            self._writer.write(data)
-            await self._writer.drain()
-        except OSError as exc:
-            raise SendError(f"Failed to send heartbeat: {exc}") from exc
+    async def _send(self, *buffers: bytes) -> None:
+        _check_message_size(buffers)
+        await self._connection.send(buffers)
 
     async def __aenter__(self) -> AsyncKrillClient:
         return self
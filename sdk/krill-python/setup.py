@@ -18,6 +18,7 @@ setup(
     license_files=["../../LICENSE.md"],
     py_modules=["krill"],
     python_requires=">=3.7",
+    extras_require={"orjson": ["orjson>=3"]},
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -1,85 +1,172 @@
 # Tests for Krill Python SDK
 
 import asyncio
+import contextlib
+import errno
+import importlib.util
 import json
 import os
+import signal
 import socket
 
 # Add parent directory to path to import krill module
 import sys
 import tempfile
 import threading
+import time
 import unittest
 from pathlib import Path
+from unittest import mock
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import krill
 
 
+def _load_without_orjson():
+    """Import a separate copy of krill that uses the stdlib JSON encoder."""
+    spec = importlib.util.spec_from_file_location(
+        "krill_stdlib", Path(__file__).parent.parent / "krill.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    with mock.patch.dict(sys.modules, {"orjson": None}):
+        spec.loader.exec_module(module)
+    return module
+
+
+def _make_socket_path(name):
+    """Return a socket path for one test class.
+
+    On Linux this is an abstract-namespace address, which needs no
+    filesystem entry and no cleanup. Elsewhere it lives in a temp dir.
+    """
+    if sys.platform.startswith("linux"):
+        return "\0krill-test-%s-%d" % (name, os.getpid())
+    return os.path.join(tempfile.mkdtemp(), name + ".sock")
+
+
+def _remove_socket_path(socket_path):
+    if socket_path.startswith("\0"):
+        return
+    try:
+        os.unlink(socket_path)
+    except FileNotFoundError:
+        pass
+    os.rmdir(os.path.dirname(socket_path))
+
+
+class _MockUDS:
+    """Listening Unix socket standing in for the daemon.
+
+    Clients connect into the listen backlog, so no accept thread or startup
+    wait is needed: once the client has closed, ``receive()`` accepts its
+    connection and reads everything that was sent.
+    """
+
+    def __init__(self, socket_path):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.bind(socket_path)
+        self.sock.listen(8)
+        self.sock.settimeout(1)
+
+    def accept(self):
+        conn, _ = self.sock.accept()
+        conn.settimeout(1)
+        return conn
+
+    def receive(self):
+        """Read one client connection to EOF, returning the received lines."""
+        buf = bytearray()
+        with self.accept() as conn:
+            while True:
+                data = conn.recv(4096)
+                if not data:
+                    break
+                buf.extend(data)
+        return buf.splitlines()
+
+    def discard_pending(self):
+        """Drop connections a test left in the backlog without reading."""
+        self.sock.setblocking(False)
+        try:
+            while True:
+                conn, _ = self.sock.accept()
+                conn.close()
+        except BlockingIOError:
+            pass
+        finally:
+            self.sock.settimeout(1)
+
+    def close(self):
+        self.sock.close()
+
+
 class TestKrillClient(unittest.TestCase):
     """Tests for synchronous KrillClient."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Listen on one Unix socket shared by every test in the class."""
+        cls.socket_path = _make_socket_path("sync")
+        cls.server = _MockUDS(cls.socket_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Close the shared socket."""
+        cls.server.close()
+        _remove_socket_path(cls.socket_path)
+
     def setUp(self):
-        """Create a temporary Unix socket for testing."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.socket_path = os.path.join(self.temp_dir, "test-krill.sock")
-        self.server_sock = None
-        self.server_thread = None
+        """Reset received messages."""
         self.received_messages = []
 
     def tearDown(self):
-        """Clean up resources."""
-        if self.server_sock:
-            self.server_sock.close()
-        if self.server_thread:
-            self.server_thread.join(timeout=1)
-        try:
-            os.unlink(self.socket_path)
-        except FileNotFoundError:
-            pass
-        try:
-            os.rmdir(self.temp_dir)
-        except OSError:
-            pass
+        """Drop any connection the test did not read."""
+        self.server.discard_pending()
 
-    def start_mock_server(self, num_messages=1):
-        """Start a mock Unix socket server that accepts connections."""
-        self.server_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        self.server_sock.bind(self.socket_path)
-        self.server_sock.listen(1)
+    @mock.patch.object(krill, "_CONNECT_RETRY_DELAYS", ())
+    def test_connection_to_nonexistent_socket_raises_error(self):
+        """Test that sending without a reachable daemon raises ConnectionError."""
+        client = krill.KrillClient("test-service", "/nonexistent/path.sock")
+        with self.assertRaises(krill.ConnectionError) as ctx:
+            client.heartbeat()
+        self.assertIn("Failed to connect", str(ctx.exception))
 
-        def server_loop():
-            conn, _ = self.server_sock.accept()
-            for _ in range(num_messages):
-                data = conn.recv(4096)
-                if not data:
-                    break
-                self.received_messages.append(data.decode("utf-8"))
-            conn.close()
+    @mock.patch.object(krill, "_CONNECT_RETRY_DELAYS", ())
+    def test_socket_creation_failure_raises_connection_error(self):
+        """Test that failing to create a socket raises ConnectionError."""
+        client = krill.KrillClient("test-service", self.socket_path)
+        error = OSError(errno.EMFILE, "Too many open files")
+        with mock.patch.object(krill.socket, "socket", side_effect=error):
+            with self.assertRaises(krill.ConnectionError):
+                client.heartbeat()
 
-        self.server_thread = threading.Thread(target=server_loop, daemon=True)
-        self.server_thread.start()
-        # Give server time to start
-        import time
+    def test_reconnects_after_connection_lost(self):
+        """Test that the next send after a failed one reconnects."""
+        client = krill.KrillClient("restarting", self.socket_path)
+        client.heartbeat()
 
-        time.sleep(0.1)
+        # Simulate the daemon dropping the connection
+        conn = self.server.accept()
+        conn.close()
+        with self.assertRaises(krill.SendError):
+            client.heartbeat()
 
-    def test_connection_to_nonexistent_socket_raises_error(self):
-        """Test that connecting to non-existent socket raises ConnectionError."""
-        with self.assertRaises(krill.ConnectionError) as ctx:
-            krill.KrillClient("test-service", "/nonexistent/path.sock")
-        self.assertIn("Failed to connect", str(ctx.exception))
+        client.report_healthy()
+        client.close()
+
+        conn = self.server.accept()
+        message = json.loads(conn.recv(4096))
+        conn.close()
+        self.assertEqual(message["service"], "restarting")
 
     def test_heartbeat_sends_correct_json(self):
         """Test that heartbeat() sends correctly formatted JSON."""
-        self.start_mock_server()
-
         client = krill.KrillClient("my-service", self.socket_path)
         client.heartbeat()
         client.close()
 
-        self.server_thread.join(timeout=1)
+        self.received_messages = self.server.receive()
 
         self.assertEqual(len(self.received_messages), 1)
         message = json.loads(self.received_messages[0])
@@ -91,41 +178,157 @@ class TestKrillClient(unittest.TestCase):
 
     def test_heartbeat_with_metadata(self):
         """Test heartbeat_with_metadata includes metadata."""
-        self.start_mock_server()
-
         client = krill.KrillClient("vision", self.socket_path)
         client.heartbeat_with_metadata({"fps": "30", "latency_ms": "10"})
         client.close()
 
-        self.server_thread.join(timeout=1)
+        self.received_messages = self.server.receive()
 
         message = json.loads(self.received_messages[0])
         self.assertEqual(message["metadata"]["fps"], "30")
         self.assertEqual(message["metadata"]["latency_ms"], "10")
 
+    def test_repeated_metadata_is_encoded_identically(self):
+        """Test a repeated metadata dict produces the same message each time."""
+        client = krill.KrillClient("vision", self.socket_path)
+        client.heartbeat_with_metadata({"fps": "30", "latency_ms": "10"})
+        client.heartbeat_with_metadata({"fps": "30", "latency_ms": "10"})
+        client.heartbeat_with_metadata({"fps": "29", "latency_ms": "10"})
+        client.close()
+
+        self.received_messages = self.server.receive()
+
+        lines = self.received_messages
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[0], lines[1])
+        message = json.loads(lines[2])
+        self.assertEqual(message["metadata"], {"fps": "29", "latency_ms": "10"})
+
+    def test_heartbeat_emitter(self):
+        """Test make_heartbeat_emitter sends metadata for its fixed keys."""
+        client_sock, daemon_sock = socket.socketpair(socket.AF_UNIX)
+
+        client = krill.KrillClient.from_fd("50%-load", client_sock.detach())
+        emit = client.make_heartbeat_emitter("iteration", "note%s")
+        emit("1", 'say "hi"')
+        client.close()
+
+        message = json.loads(daemon_sock.recv(4096))
+        daemon_sock.close()
+        self.assertEqual(message["service"], "50%-load")
+        self.assertEqual(message["status"], "healthy")
+        self.assertEqual(message["metadata"], {"iteration": "1", "note%s": 'say "hi"'})
+
+        with self.assertRaises(TypeError):
+            emit("only-one")
+
+    def test_heartbeat_kv(self):
+        """Test heartbeat_kv splices pre-encoded pairs into the metadata."""
+        client_sock, daemon_sock = socket.socketpair(socket.AF_UNIX)
+
+        client = krill.KrillClient.from_fd("vision", client_sock.detach())
+        client.heartbeat_kv((b'"fps"', b'"30"'), (b'"latency_ms"', b'"10"'))
+        client.close()
+
+        message = json.loads(daemon_sock.recv(4096))
+        daemon_sock.close()
+        self.assertEqual(message["status"], "healthy")
+        self.assertEqual(message["metadata"], {"fps": "30", "latency_ms": "10"})
+
+    def test_batched_sends_messages_in_one_write(self):
+        """Test that batched() holds messages until the block exits."""
+        client_sock, daemon_sock = socket.socketpair(socket.AF_UNIX)
+        daemon_sock.setblocking(False)
+
+        client = krill.KrillClient.from_fd("lidar", client_sock.detach())
+        with client.batched():
+            client.heartbeat()
+            client.heartbeat_with_metadata({"scan": "1"})
+            client.report_degraded("dropout")
+            with self.assertRaises(BlockingIOError):
+                daemon_sock.recv(4096)
+        client.close()
+
+        lines = daemon_sock.recv(4096).splitlines()
+        daemon_sock.close()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[2])["status"], "degraded")
+
+    def test_flush_writes_queued_messages_early(self):
+        """Test that flush() inside batched() delivers queued messages at once."""
+        client_sock, daemon_sock = socket.socketpair(socket.AF_UNIX)
+        daemon_sock.setblocking(False)
+
+        client = krill.KrillClient.from_fd("lidar", client_sock.detach())
+        with client.batched():
+            client.heartbeat()
+            client.heartbeat_with_metadata({"scan": "1"})
+            client.flush()
+            self.assertEqual(len(daemon_sock.recv(4096).splitlines()), 2)
+
+            client.report_degraded("dropout")
+            with self.assertRaises(BlockingIOError):
+                daemon_sock.recv(4096)
+        client.close()
+
+        lines = daemon_sock.recv(4096).splitlines()
+        daemon_sock.close()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["status"], "degraded")
+
+    def test_nested_batched_joins_outer_batch(self):
+        """Test that a nested batched() block writes only when the outer one exits."""
+        client_sock, daemon_sock = socket.socketpair(socket.AF_UNIX)
+        daemon_sock.setblocking(False)
+
+        client = krill.KrillClient.from_fd("lidar", client_sock.detach())
+        with client.batched():
+            client.heartbeat()
+            with client.batched():
+                client.heartbeat_with_metadata({"scan": "1"})
+            with self.assertRaises(BlockingIOError):
+                daemon_sock.recv(4096)
+            client.report_degraded("dropout")
+        client.close()
+
+        lines = daemon_sock.recv(4096).splitlines()
+        daemon_sock.close()
+        self.assertEqual(
+            [json.loads(line)["status"] for line in lines],
+            ["healthy", "healthy", "degraded"],
+        )
+
     def test_report_degraded(self):
         """Test report_degraded sends degraded status with reason."""
-        self.start_mock_server()
-
         client = krill.KrillClient("camera", self.socket_path)
         client.report_degraded("high temperature")
         client.close()
 
-        self.server_thread.join(timeout=1)
+        self.received_messages = self.server.receive()
 
         message = json.loads(self.received_messages[0])
         self.assertEqual(message["status"], "degraded")
         self.assertEqual(message["metadata"]["reason"], "high temperature")
 
+    def test_report_degraded_escapes_lone_surrogates(self):
+        """Test a reason with a lone surrogate is sent escaped."""
+        client = krill.KrillClient("storage", self.socket_path)
+        client.report_degraded("cannot read /data/\udcff")
+        client.close()
+
+        self.received_messages = self.server.receive()
+
+        self.assertIn(b"\\udcff", self.received_messages[0])
+        message = json.loads(self.received_messages[0])
+        self.assertEqual(message["metadata"]["reason"], "cannot read /data/\udcff")
+
     def test_report_healthy(self):
         """Test report_healthy sends healthy status."""
-        self.start_mock_server()
-
         client = krill.KrillClient("sensor", self.socket_path)
         client.report_healthy()
         client.close()
 
-        self.server_thread.join(timeout=1)
+        self.received_messages = self.server.receive()
 
         message = json.loads(self.received_messages[0])
         self.assertEqual(message["status"], "healthy")
@@ -133,8 +336,6 @@ class TestKrillClient(unittest.TestCase):
 
     def test_context_manager_closes_connection(self):
         """Test that using client as context manager closes connection."""
-        self.start_mock_server()
-
         with krill.KrillClient("test", self.socket_path) as client:
             client.heartbeat()
 
@@ -142,61 +343,171 @@ class TestKrillClient(unittest.TestCase):
         with self.assertRaises(krill.SendError):
             client.heartbeat()
 
+    def test_socket_options_are_applied(self):
+        """Test that socket_options are set on the daemon connection."""
+        client = krill.KrillClient(
+            "tuned",
+            self.socket_path,
+            socket_options=[(socket.SOL_SOCKET, socket.SO_SNDBUF, 65536)],
+        )
+        client.heartbeat()
+        sndbuf = client._sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF)
+        client.close()
+
+        # Linux reports double the requested size to account for overhead
+        self.assertIn(sndbuf, (65536, 131072))
+
+    def test_from_fd_uses_existing_connection(self):
+        """Test that from_fd sends on the given socket without connecting."""
+        client_sock, daemon_sock = socket.socketpair(socket.AF_UNIX)
+
+        client = krill.KrillClient.from_fd("shared", client_sock.detach())
+        client.heartbeat()
+        client.close()
+
+        message = json.loads(daemon_sock.recv(4096))
+        daemon_sock.close()
+        self.assertEqual(message["service"], "shared")
+        self.assertEqual(message["status"], "healthy")
+
+    def test_from_fd_makes_socket_blocking(self):
+        """Test that from_fd clears O_NONBLOCK on the inherited socket."""
+        client_sock, daemon_sock = socket.socketpair(socket.AF_UNIX)
+        client_sock.setblocking(False)
+
+        client = krill.KrillClient.from_fd("shared", client_sock.detach())
+        self.assertTrue(os.get_blocking(client._sock.fileno()))
+        client.close()
+        daemon_sock.close()
+
+    def test_from_fd_reconnects_to_given_socket_path(self):
+        """Test that from_fd reconnects to socket_path once the fd is lost."""
+        client_sock, daemon_sock = socket.socketpair(socket.AF_UNIX)
+        daemon_sock.close()
+
+        client = krill.KrillClient.from_fd(
+            "shared", client_sock.detach(), socket_path=self.socket_path
+        )
+        with self.assertRaises(krill.SendError):
+            client.heartbeat()
+        client.heartbeat()
+        client.close()
+
+        self.received_messages = self.server.receive()
+        message = json.loads(self.received_messages[0])
+        self.assertEqual(message["service"], "shared")
+
+    def test_from_pool_shares_client_until_closed(self):
+        """Test from_pool returns one client per service until it is closed."""
+        from_pool = krill.KrillClient.from_pool
+        client = from_pool("pooled", self.socket_path)
+        other = from_pool("other", self.socket_path)
+        self.assertIs(from_pool("pooled", self.socket_path), client)
+        self.assertIsNot(other, client)
+        other.close()
+
+        client.heartbeat()
+        from_pool("pooled", self.socket_path).report_healthy()
+        client.close()
+
+        replacement = from_pool("pooled", self.socket_path)
+        self.assertIsNot(replacement, client)
+        replacement.close()
+
+        self.received_messages = self.server.receive()
+        self.assertEqual(len(self.received_messages), 2)
+
+    def test_oversized_message_raises_send_error(self):
+        """Test that messages over the atomic write limit are rejected."""
+        client = krill.KrillClient("camera", self.socket_path)
+        with self.assertRaises(krill.SendError) as ctx:
+            client.heartbeat_with_metadata({"blob": "x" * 8192})
+        client.close()
+
+        self.assertIn("byte limit", str(ctx.exception))
+
+    def test_report_degraded_truncates_long_reason(self):
+        """Test an over-long reason is cut to fit the message limit."""
+        client = krill.KrillClient("camera", self.socket_path)
+        for reason in ("x" * 8192, "ü\n" * 4096, '"\\' * 4096):
+            client.report_degraded(reason)
+        client.close()
+
+        self.received_messages = self.server.receive()
+
+        self.assertEqual(len(self.received_messages), 3)
+        for line in self.received_messages:
+            # Only as much as needed is cut; the newline is the last byte
+            self.assertGreater(len(line) + 1, 4090)
+            self.assertLessEqual(len(line) + 1, 4096)
+            reason = json.loads(line)["metadata"]["reason"]
+            self.assertTrue(reason.endswith("... [truncated]"))
+
     def test_multiple_heartbeats(self):
         """Test sending multiple heartbeats on same connection."""
-        self.start_mock_server(num_messages=3)
-
         client = krill.KrillClient("lidar", self.socket_path)
         client.heartbeat()
         client.heartbeat_with_metadata({"scan": "1"})
         client.report_healthy()
         client.close()
 
-        self.server_thread.join(timeout=1)
+        self.received_messages = self.server.receive()
 
-        # Messages may arrive in multiple chunks
-        all_data = "".join(self.received_messages)
-        lines = all_data.strip().split("\n")
-        self.assertEqual(len(lines), 3)
+        self.assertEqual(len(self.received_messages), 3)
 
 
 class TestAsyncKrillClient(unittest.TestCase):
     """Tests for asynchronous AsyncKrillClient."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Pick one Unix socket address shared by every test in the class."""
+        cls.socket_path = _make_socket_path("async")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared socket address."""
+        _remove_socket_path(cls.socket_path)
+
     def setUp(self):
-        """Create a temporary Unix socket for testing."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.socket_path = os.path.join(self.temp_dir, "test-krill-async.sock")
+        """Reset received messages."""
         self.received_messages = []
 
-    def tearDown(self):
-        """Clean up resources."""
-        try:
-            os.unlink(self.socket_path)
-        except FileNotFoundError:
-            pass
-        try:
-            os.rmdir(self.temp_dir)
-        except OSError:
-            pass
+    @contextlib.asynccontextmanager
+    async def mock_server(self, num_clients=1, reading=None, drop=0):
+        """Serve the socket until the block exits and the clients have left.
 
-    async def mock_server(self, num_clients=1):
-        """Async mock server."""
+        The listener is bound before the block runs, so tests can connect
+        immediately instead of waiting for a server task to start. If a
+        ``reading`` event is given, the server stalls until it is set. The
+        first ``drop`` connections are hung up on without being read.
+        """
+        disconnected = asyncio.Queue()
+        accepted = []
 
         async def handle_client(reader, writer):
-            while True:
-                data = await reader.read(4096)
-                if not data:
+            accepted.append(writer)
+            dropped = len(accepted) <= drop
+            if reading is not None:
+                await reading.wait()
+            # One entry per newline-framed message
+            while not dropped:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError:
                     break
-                self.received_messages.append(data.decode("utf-8"))
+                self.received_messages.append(line)
             writer.close()
             await writer.wait_closed()
+            disconnected.put_nowait(writer)
 
         server = await asyncio.start_unix_server(handle_client, self.socket_path)
-
         async with server:
-            await server.serve_forever()
+            yield
+            for _ in range(num_clients):
+                await asyncio.wait_for(disconnected.get(), timeout=1)
 
+    @mock.patch.object(krill, "_CONNECT_RETRY_DELAYS", ())
     def test_async_connection_to_nonexistent_socket(self):
         """Test async connect to non-existent socket raises error."""
 
@@ -210,20 +521,12 @@ class TestAsyncKrillClient(unittest.TestCase):
         """Test async heartbeat sends correct JSON."""
 
         async def test():
-            server_task = asyncio.create_task(self.mock_server())
-            await asyncio.sleep(0.1)  # Let server start
-
-            client = await krill.AsyncKrillClient.connect(
-                "async-service", self.socket_path
-            )
-            await client.heartbeat()
-            await client.close()
-
-            server_task.cancel()
-            try:
-                await server_task
-            except asyncio.CancelledError:
-                pass
+            async with self.mock_server():
+                client = await krill.AsyncKrillClient.connect(
+                    "async-service", self.socket_path
+                )
+                await client.heartbeat()
+                await client.close()
 
             self.assertTrue(len(self.received_messages) > 0)
             message = json.loads(self.received_messages[0])
@@ -237,19 +540,11 @@ class TestAsyncKrillClient(unittest.TestCase):
         """Test async client as context manager."""
 
         async def test():
-            server_task = asyncio.create_task(self.mock_server())
-            await asyncio.sleep(0.1)
-
-            async with await krill.AsyncKrillClient.connect(
-                "test", self.socket_path
-            ) as client:
-                await client.heartbeat()
-
-            server_task.cancel()
-            try:
-                await server_task
-            except asyncio.CancelledError:
-                pass
+            async with self.mock_server():
+                async with await krill.AsyncKrillClient.connect(
+                    "test", self.socket_path
+                ) as client:
+                    await client.heartbeat()
 
             self.assertTrue(len(self.received_messages) > 0)
 
@@ -259,24 +554,16 @@ class TestAsyncKrillClient(unittest.TestCase):
         """Test sending multiple heartbeats async."""
 
         async def test():
-            server_task = asyncio.create_task(self.mock_server())
-            await asyncio.sleep(0.1)
-
-            client = await krill.AsyncKrillClient.connect("multi", self.socket_path)
-            await client.heartbeat()
-            await client.heartbeat_with_metadata({"count": "1"})
-            await client.report_degraded("test reason")
-            await client.report_healthy()
-            await client.close()
-
-            server_task.cancel()
-            try:
-                await server_task
-            except asyncio.CancelledError:
-                pass
+            async with self.mock_server():
+                client = await krill.AsyncKrillClient.connect("multi", self.socket_path)
+                await client.heartbeat()
+                await client.heartbeat_with_metadata({"count": "1"})
+                await client.report_degraded("test reason")
+                await client.report_healthy()
+                await client.close()
 
             # Should have received all messages
-            lines = self.received_messages[0].strip().split("\n")
+            lines = self.received_messages
             self.assertEqual(len(lines), 4)
 
             # Check first and third message
@@ -289,6 +576,215 @@ class TestAsyncKrillClient(unittest.TestCase):
 
         asyncio.run(test())
 
+    def test_async_reconnects_after_connection_lost(self):
+        """Test that the next async send after a lost connection reconnects."""
+
+        async def test():
+            async with self.mock_server(num_clients=2, drop=1):
+                client = await krill.AsyncKrillClient.connect(
+                    "restarting", self.socket_path
+                )
+                # Wait for the daemon's hang-up to reach the client
+                await asyncio.wait_for(
+                    client._connection._protocol.wait_closed(), timeout=1
+                )
+
+                await client.heartbeat()
+                await client.close()
+
+            self.assertEqual(len(self.received_messages), 1)
+            message = json.loads(self.received_messages[0])
+            self.assertEqual(message["service"], "restarting")
+
+        asyncio.run(test())
+
+    def test_async_send_waits_for_stalled_daemon(self):
+        """Test a sender that never yields still waits on a backed-up socket."""
+
+        async def test():
+            reading = asyncio.Event()
+            async with self.mock_server(reading=reading):
+                client = await krill.AsyncKrillClient.connect("bulk", self.socket_path)
+
+                async def produce():
+                    for i in range(1000):
+                        await client.heartbeat_with_metadata(
+                            {"i": str(i), "blob": "x" * 3000}
+                        )
+
+                producer = asyncio.create_task(produce())
+                await asyncio.sleep(0.1)
+                self.assertFalse(producer.done())
+
+                reading.set()
+                await producer
+                await client.close()
+
+            self.assertEqual(len(self.received_messages), 1000)
+
+        asyncio.run(test())
+
+    def test_async_concurrent_senders_resume_after_stall(self):
+        """Test every sender waiting on a backed-up connection is resumed."""
+
+        async def test():
+            reading = asyncio.Event()
+            async with self.mock_server(reading=reading):
+                client = await krill.AsyncKrillClient.connect("first", self.socket_path)
+
+                async def produce(sender):
+                    for i in range(500):
+                        await sender.heartbeat_with_metadata(
+                            {"i": str(i), "blob": "x" * 3000}
+                        )
+
+                producers = asyncio.gather(
+                    produce(client), produce(client.for_service("second"))
+                )
+                await asyncio.sleep(0.1)
+                self.assertFalse(producers.done())
+
+                reading.set()
+                await asyncio.wait_for(producers, timeout=5)
+                await client.close()
+
+            self.assertEqual(len(self.received_messages), 1000)
+
+        asyncio.run(test())
+
+    def test_async_socket_options_are_applied(self):
+        """Test that socket_options are set on the async daemon connection."""
+
+        async def test():
+            async with self.mock_server():
+                client = await krill.AsyncKrillClient.connect(
+                    "tuned",
+                    self.socket_path,
+                    socket_options=[(socket.SOL_SOCKET, socket.SO_SNDBUF, 65536)],
+                )
+                transport = client._connection._protocol.transport
+                sock = transport.get_extra_info("socket")
+                sndbuf = sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF)
+                await client.close()
+
+            # Linux reports double the requested size to account for overhead
+            self.assertIn(sndbuf, (65536, 131072))
+
+        asyncio.run(test())
+
+    def test_async_message_size_limit(self):
+        """Test the async client applies the same 4096-byte limit."""
+
+        async def test():
+            async with self.mock_server():
+                client = await krill.AsyncKrillClient.connect(
+                    "camera", self.socket_path
+                )
+                with self.assertRaises(krill.SendError):
+                    await client.heartbeat_with_metadata({"blob": "x" * 8192})
+                await client.report_degraded("x" * 8192)
+                await client.close()
+
+            self.assertEqual(len(self.received_messages), 1)
+            self.assertLessEqual(len(self.received_messages[0]), 4096)
+            reason = json.loads(self.received_messages[0])["metadata"]["reason"]
+            self.assertTrue(reason.endswith("... [truncated]"))
+
+        asyncio.run(test())
+
+    def test_async_for_service_shares_connection(self):
+        """Test for_service sends heartbeats for another service on one connection."""
+
+        async def test():
+            async with self.mock_server():
+                client = await krill.AsyncKrillClient.connect("first", self.socket_path)
+                await client.heartbeat()
+                await client.for_service("second").report_degraded("shared")
+                await client.close()
+
+            self.assertEqual(
+                [json.loads(line)["service"] for line in self.received_messages],
+                ["first", "second"],
+            )
+
+        asyncio.run(test())
+
+
+class TestEncoding(unittest.TestCase):
+    """Test that both JSON encoders produce the same messages."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the stdlib-only variant next to the regular module."""
+        cls.stdlib = _load_without_orjson()
+
+    def test_encoders_agree(self):
+        """Test orjson (when installed) and stdlib encode values identically."""
+        cases = [
+            ({"fps": "30"}, b'{"fps":"30"}'),
+            ({1: "é", None: "b"}, b'{"1":"\xc3\xa9","null":"b"}'),
+            ({"note": 'naïve "quoted"'}, b'{"note":"na\xc3\xafve \\"quoted\\""}'),
+            ("/data/\udcff", b'"/data/\\udcff"'),
+        ]
+        for value, expected in cases:
+            for module in (krill, self.stdlib):
+                with self.subTest(value=value, module=module.__name__):
+                    self.assertEqual(module._encode_json(value), expected)
+
+    def test_metadata_cache_keeps_equal_values_apart(self):
+        """Test equal metadata of different types is not served from the cache."""
+        cases = [
+            ({"x": 1}, b'{"x":1}'),
+            ({"x": True}, b'{"x":true}'),
+            ({"x": 1.0}, b'{"x":1.0}'),
+            ({"x": "1"}, b'{"x":"1"}'),
+            ({True: "1"}, b'{"true":"1"}'),
+        ]
+        for module in (krill, self.stdlib):
+            for metadata, expected in cases:
+                with self.subTest(metadata=metadata, module=module.__name__):
+                    self.assertEqual(module._encode_metadata(metadata), expected)
+
+    def test_unserializable_value_raises_type_error(self):
+        """Test values JSON cannot represent raise TypeError on both paths."""
+        for module in (krill, self.stdlib):
+            with self.subTest(module=module.__name__):
+                with self.assertRaises(TypeError):
+                    module._encode_json({"x": object()})
+                with self.assertRaises(TypeError):
+                    module._encode_metadata({"x": object()})
+
+
+class TestSleepUntil(unittest.TestCase):
+    """Tests for sleep_until."""
+
+    def test_past_deadline_returns_immediately(self):
+        """Test a deadline in the past does not sleep."""
+        start = time.monotonic()
+        self.assertFalse(krill.sleep_until(time.monotonic_ns() - 1_000_000_000))
+        self.assertLess(time.monotonic() - start, 0.05)
+
+    def test_future_deadline_does_not_return_early(self):
+        """Test sleep_until returns no earlier than the deadline."""
+        for stop in (None, threading.Event()):
+            with self.subTest(stop=stop):
+                deadline = time.monotonic_ns() + 50_000_000
+                self.assertFalse(krill.sleep_until(deadline, stop))
+                self.assertGreaterEqual(time.monotonic_ns(), deadline)
+
+    def test_stop_set_by_signal_handler_wakes_sleep(self):
+        """Test a stop event set from a signal handler ends the sleep early."""
+        stop = threading.Event()
+        previous = signal.signal(signal.SIGUSR1, lambda signum, frame: stop.set())
+        self.addCleanup(signal.signal, signal.SIGUSR1, previous)
+        timer = threading.Timer(0.05, os.kill, (os.getpid(), signal.SIGUSR1))
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        start = time.monotonic()
+        self.assertTrue(krill.sleep_until(time.monotonic_ns() + 5_000_000_000, stop))
+        self.assertLess(time.monotonic() - start, 1)
+
 
 class TestErrorClasses(unittest.TestCase):
     """Test error classes."""